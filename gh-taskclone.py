@@ -5,15 +5,209 @@
 #
 
 import argparse
+import functools
+import json
+import logging
+import logging.handlers
 import os
+import queue
+import random
 import sys
+import threading
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import github3  # Ensure installed: pip install github3.py
+import requests # Installed along with github3.py
 
-# Global cache for target labels to avoid repeated API calls
+log = logging.getLogger('gh-taskclone')
+
+# Serializes writes to the checkpoint file from the worker threads
+checkpoint_lock = threading.Lock()
+
+# Set when a batch of issues fails for good, so the other workers stop too
+batch_failed = threading.Event()
+
+# Global caches for target labels and milestones to avoid repeated API calls
 target_labels_cache = None
+target_milestones_cache = None
+
+# Labels that couldn't be created or found in the target, so they aren't retried
+failed_labels = set()
+
+# On-disk cache of list responses and their ETags, reused across runs
+CACHE_DIR = Path.home() / '.cache' / 'gh-taskclone'
+
+# Fetch everything get_issues needs in one paginated GraphQL query instead of
+# walking the REST issue list and then fetching each issue's labels. Keep the
+# field selection to what's actually used; the REST payload is far larger.
+ISSUES_QUERY = """
+query($owner: String!, $name: String!, $label: String!, $cursor: String, $withBody: Boolean!) {
+  repository(owner: $owner, name: $name) {
+    issues(first: 100, labels: [$label], states: [OPEN, CLOSED], after: $cursor) {
+      pageInfo { endCursor hasNextPage }
+      nodes {
+        number
+        title
+        body @include(if: $withBody)
+        labels(first: 50) { nodes { name color } }
+        milestone { number title description state dueOn }
+      }
+    }
+  }
+}
+"""
+
+# Lightweight stand-ins for github3's Label and Milestone objects, so the
+# GraphQL results can be used by the rest of the script unchanged.
+SourceLabel = namedtuple('SourceLabel', ['name', 'color'])
+SourceMilestone = namedtuple('SourceMilestone',
+                             ['number', 'title', 'description', 'state', 'due_on'])
+
+# Number of createIssue mutations packed into a single GraphQL request. Kept
+# small, as Github gives up on GraphQL requests that take more than ~10s
+ISSUE_BATCH_SIZE = 5
+
+# (connect, read) timeout for mutations; longer than github3's default 10s
+# read timeout, so we get Github's own answer rather than a ReadTimeout
+MUTATION_TIMEOUT = (4, 30)
+
+# Number of issue batches being created concurrently
+ISSUE_WORKERS = 8
+
+# Number of missing labels being created concurrently
+LABEL_WORKERS = 4
+
+# Number of fetched issues buffered ahead of issue creation
+ISSUE_QUEUE_SIZE = 50
+
+# Connections kept alive for the worker threads sharing the API session
+HTTP_POOL_SIZE = 32
+
+# Attempts made at a request failing transiently, and the backoff between them
+RETRY_ATTEMPTS = 6
+RETRY_BASE = 2.0
+RETRY_JITTER = 0.5
+
+# HTTP status codes worth retrying; 403 only when it's a rate limit
+RETRYABLE_STATUS = (403, 429, 502, 503, 504)
+
+# Rate limit status codes only, for requests that aren't safe to repeat: when
+# rate limited, Github hasn't done anything, but after a 5xx or a timeout it
+# may well have
+RATE_LIMIT_STATUS = (403, 429)
+
+
+class GraphQLError(github3.exceptions.GitHubException):
+    """Raised when a GraphQL response carries an 'errors' member."""
+
+    def __init__(self, errors, data=None):
+        super().__init__('; '.join(e.get('message', str(e)) for e in errors))
+        self.errors = errors
+        self.data = data # Partial results, if any
+        self.code = None # No HTTP status; keeps 'e.code' checks working
+
+
+class ContentCreationLimiter:
+    """Paces content creation (issues, labels, milestones) across worker threads.
+
+    Requests are charged per item they create, so a batch of issues costs as
+    much as creating them one by one, and items are spread out to stay within
+    per_minute overall. At most max_inflight requests run at once. Use as
+    ``with limiter.acquire(cost):`` around each request.
+    """
+
+    def __init__(self, per_minute=60, max_inflight=20):
+        self.interval = 60.0 / per_minute
+        self.inflight = threading.Semaphore(max_inflight)
+        self.lock = threading.Lock()
+        self.next_start = time.monotonic()
+
+    def acquire(self, cost=1):
+        """Waits until a request creating cost items may start."""
+        self.inflight.acquire()
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + cost * self.interval
+        if start > now:
+            time.sleep(start - now)
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.inflight.release()
+
+
+# Global pacing for content creation, shared by all workers. Github allows
+# about 80 content-creating requests per minute; stay well below that
+content_limiter = ContentCreationLimiter(per_minute=60)
+
+
+def is_rate_limited(e):
+    """Checks if an exception is one of Github's primary or secondary rate limits."""
+    response = getattr(e, 'response', None)
+    if response is not None and response.headers.get('X-RateLimit-Remaining') == '0':
+        return True
+    # GraphQL reports rate limits in the response body, not the status code
+    if isinstance(e, GraphQLError) and any(err.get('type') == 'RATE_LIMITED' for err in e.errors):
+        return True
+    message = str(e).lower()
+    return 'abuse' in message or 'rate limit' in message or 'submitted too quickly' in message
+
+
+def is_retryable(e, retry_on, retry_connection_errors):
+    """Checks if a failed request is worth retrying."""
+    if isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                      github3.exceptions.ConnectionError)):
+        return retry_connection_errors
+    if isinstance(e, GraphQLError):
+        # Only safe to repeat if nothing in the request got done
+        return is_rate_limited(e) and not any((e.data or {}).values())
+    code = getattr(e, 'code', None)
+    if code == 403:
+        return 403 in retry_on and is_rate_limited(e)
+    return code in retry_on
+
+
+def retry_delay(e, attempt, base, jitter):
+    """Works out how long to wait before retrying a failed request."""
+    # Prefer what Github tells us, if anything
+    response = getattr(e, 'response', None)
+    headers = response.headers if response is not None else {}
+    if headers.get('Retry-After'):
+        return float(headers['Retry-After'])
+    if headers.get('X-RateLimit-Remaining') == '0' and headers.get('X-RateLimit-Reset'):
+        return max(0.0, int(headers['X-RateLimit-Reset']) - time.time()) + 1
+
+    # Exponential backoff, with jitter so the workers don't retry in lockstep
+    return base ** attempt * random.uniform(1 - jitter, 1 + jitter)
+
+
+def retry_with_backoff(max_attempts=RETRY_ATTEMPTS, base=RETRY_BASE, jitter=RETRY_JITTER,
+                       retry_on=RETRYABLE_STATUS, retry_connection_errors=True):
+    """Decorator retrying an API call on transient errors, with exponential backoff."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except (github3.exceptions.GitHubException,
+                        requests.exceptions.RequestException) as e:
+                    if attempt == max_attempts or \
+                       not is_retryable(e, retry_on, retry_connection_errors):
+                        raise
+                    delay = retry_delay(e, attempt, base, jitter)
+                    log.warning("  Request failed (%s), retrying in %.1f seconds...", e, delay)
+                    time.sleep(delay)
+        return wrapper
+    return decorator
+
 
 def read_command_line():
     """Read the command line arguments."""
@@ -37,174 +231,532 @@ def read_command_line():
                         help="a comma delimited list of labels to copy "
                              "(in addition to the selection label). "
                              "If omitted, all labels will be copied.")
+    parser.add_argument("--no-body", action="store_true",
+                        help="Don't fetch or copy the issue bodies (first "
+                             "comment), only titles. Default: False")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Show details of every issue being copied. "
+                             "Default: False")
 
     return parser.parse_args()
 
 
-def get_issues(repo, label_name):
-    """Fetches issues with a specific label, including their milestone."""
-    print(f"\nFetching issues from '{repo.full_name}' with label '{label_name}'...")
-    issues_data = []
-    # repo.issues expects a list of labels
-    for i in repo.issues(labels=[label_name], state='all'):
-        # Skip pull requests if they appear
-        if i.pull_request_urls:
-            continue
+def graphql(session, query, variables=None, timeout=None):
+    """Runs a GraphQL query against the GitHub v4 API and returns its data."""
+    response = session.post(session.build_url('graphql'),
+                            json={'query': query, 'variables': variables or {}},
+                            timeout=timeout or session.timeout)
+    if response.status_code >= 400:
+        raise github3.exceptions.error_for(response)
+
+    result = response.json()
+    if result.get('errors'):
+        raise GraphQLError(result['errors'], result.get('data'))
+    return result['data']
+
+
+def fetch_issues_graphql(session, owner, repo, label, with_body=True):
+    """Yields issues with a specific label, using paginated GraphQL queries."""
+    variables = {'owner': owner, 'name': repo, 'label': label, 'cursor': None,
+                 'withBody': with_body}
+
+    while True:
+        data = graphql(session, ISSUES_QUERY, variables)
+        issues = data['repository']['issues']
+
+        # Unlike the REST issue list, the issues connection never includes
+        # pull requests, so there's nothing to filter out here
+        for node in issues['nodes']:
+            milestone = node['milestone']
+            issue = {'title': node['title'],
+                     'body': node.get('body') or '', # Ensure not None
+                     'labels': [SourceLabel(l['name'], l['color'])
+                                for l in node['labels']['nodes']],
+                     'milestone': SourceMilestone(milestone['number'],
+                                                  milestone['title'],
+                                                  milestone['description'],
+                                                  milestone['state'].lower(),
+                                                  milestone['dueOn'])
+                                  if milestone else None,
+                     'number': node['number'] # Keep track of original number for info
+                    }
+            yield issue
+
+        if not issues['pageInfo']['hasNextPage']:
+            break
+        variables['cursor'] = issues['pageInfo']['endCursor']
+
+
+def get_issues(repo, label_name, with_body=True):
+    """Yields issues with a specific label, including their milestone.
+
+    Only the fields used here are requested from Github (see ISSUES_QUERY):
+    number, title, body (unless with_body is False), label names and colors,
+    and the milestone's number, title, description, state and due date.
+    Pull requests are excluded by Github itself, as they aren't part of the
+    issues connection.
+    """
+    log.info("\nFetching issues from '%s' with label '%s'...", repo.full_name, label_name)
+    found = 0
+    for issue in fetch_issues_graphql(repo.session, repo.owner.login, repo.name, label_name,
+                                      with_body):
+        found += 1
+        yield issue
+    log.info("\nFound %s issues.", found)
+
+
+def queue_issues(issues, issue_queue, errors):
+    """Feeds issues into a queue from a background thread, ending with None."""
+    try:
+        for issue in issues:
+            issue_queue.put(issue)
+    except Exception as e:
+        errors.append(e) # Re-raised by the consumer
+    finally:
+        issue_queue.put(None)
+
+
+def fetch_cached_list(repo, resource, params=None):
+    """Lists a repository resource (e.g. labels), using ETags cached on disk.
+
+    Each page is requested with If-None-Match, and a 304 Not Modified reply
+    (which doesn't count against the rate limit) is served from the cache.
+    """
+    cache_path = CACHE_DIR / f'{repo.owner.login}-{repo.name}-{resource}.json'
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    items = []
+    pages = {}
+    url = repo._build_url(resource, base_url=repo._api)
+    params = dict(params or {}, per_page=100)
+    while url:
+        cached = cache.get(url)
+        headers = {'If-None-Match': cached['etag']} if cached and cached['etag'] else {}
+        response = repo.session.get(url, params=params, headers=headers)
+        if response.status_code == 304:
+            page = cached
+        elif response.status_code == 200:
+            page = {'etag': response.headers.get('ETag'),
+                    'items': response.json(),
+                    'next': response.links.get('next', {}).get('url')}
+        else:
+            raise github3.exceptions.error_for(response)
+
+        pages[url] = page
+        items.extend(page['items'])
+        url = page['next']
+        params = None # The 'next' link already carries the query string
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w') as f:
+            json.dump(pages, f)
+    except OSError as e:
+        log.warning("  Could not write cache file '%s': %s", cache_path, e)
+
+    return items
+
+
+def load_label_cache(repo):
+    """Fetches the labels of a repo, via the on-disk ETag cache."""
+    return [github3.issues.label.Label(l, repo) for l in fetch_cached_list(repo, 'labels')]
+
 
-        source_labels = list(i.labels()) # Get Label objects
+def load_milestone_cache(repo):
+    """Fetches all milestones of a repo, via the on-disk ETag cache."""
+    return [github3.issues.milestone.Milestone(m, repo)
+            for m in fetch_cached_list(repo, 'milestones', {'state': 'all'})]
 
-        issue = {'title': i.title,
-                 'body': i.body or '', # Ensure not None
-                 'labels': source_labels, # List of Label objects
-                 'milestone': i.milestone, # Milestone object or None
-                 'number': i.number # Keep track of original number for info
-                }
-        issues_data.append(issue)
-    print(f"Found {len(issues_data)} issues.")
-    return issues_data
 
+@retry_with_backoff()
+def paced_create_label(target_repo, name, color):
+    """Runs target_repo.create_label under the content limiter."""
+    with content_limiter.acquire():
+        return target_repo.create_label(name, color)
 
-def create_labels(target_repo, source_labels, selection_label, whitelist_labels):
-    """Ensures necessary labels exist in the target repo."""
+
+def create_label(target_repo, name, color):
+    """Creates a single label in the target repo, returning it (or None)."""
+    log.info('  Creating label: %s', name)
+    try:
+        return paced_create_label(target_repo, name, color)
+    except github3.exceptions.GitHubException as e:
+        # 422 often means it already exists (race condition/cache miss)
+        if getattr(e, 'code', None) == 422:
+            log.warning("    Label '%s' likely already exists (422).", name)
+            # Try to fetch it to add to cache if possible
+            try:
+               existing = target_repo.label(name)
+            except github3.exceptions.GitHubException:
+               existing = None
+            if existing is None: # github3 returns None on a 404
+               log.warning("    Could not confirm existence of '%s'.", name)
+            return existing
+        else:
+            log.error('    Error creating the label %s: %s', name, e)
+            sys.exit(1)
+
+
+def ensure_labels_bulk(target_repo, needed):
+    """Ensures the needed labels (a name -> color dict) exist in the target repo."""
     global target_labels_cache
 
     # Fetch and cache target labels once if not already done
     if target_labels_cache is None:
-        print("Fetching existing labels from target repo...")
-        target_labels_cache = {lbl.name: lbl for lbl in target_repo.labels()}
-        print(f"Found {len(target_labels_cache)} labels in target.")
-
-    for src_label in source_labels:
-        # Check if we should copy this label
-        if src_label.name == selection_label or \
-           len(whitelist_labels) == 0 or \
-           src_label.name in whitelist_labels:
-
-            # Check if it exists in the target cache
-            if src_label.name not in target_labels_cache:
-                print(f'  Creating label: {src_label.name}')
-                try:
-                    new_label = target_repo.create_label(src_label.name, src_label.color)
-                    target_labels_cache[new_label.name] = new_label # Add to cache
-                except github3.exceptions.GitHubException as e:
-                    # 422 often means it already exists (race condition/cache miss)
-                    if e.code == 422:
-                        print(f"    Label '{src_label.name}' likely already exists (422).")
-                        # Try to fetch it to add to cache if possible
-                        try:
-                           target_labels_cache[src_label.name] = target_repo.label(src_label.name)
-                        except github3.exceptions.GitHubException:
-                           print(f"    Could not confirm existence of '{src_label.name}'.")
-                    else:
-                        print(f'    Error creating the label {src_label.name}: {e}')
-                        sys.exit(1)
-
-
-def clone_milestones(source_repo, target_repo):
-    """Clones milestones from source_repo to dest_repo if they don't exist."""
-    print("\nAttempting to clone milestones...")
-    milestone_map = {} # Maps source_number -> target_object
-
-    try:
-        source_milestones_list = list(source_repo.milestones(state='all'))
-        target_milestones_list = list(target_repo.milestones(state='all'))
-        target_milestones_titles = {m.title: m for m in target_milestones_list}
-
-        print(f"Found {len(source_milestones_list)} milestones in '{source_repo.full_name}'.")
-        print(f"Found {len(target_milestones_list)} milestones in '{target_repo.full_name}'.")
-
-        for sm in source_milestones_list:
-            if sm.title in target_milestones_titles:
-                dm = target_milestones_titles[sm.title]
-                print(f"  - Milestone '{sm.title}' already exists.")
-                milestone_map[sm.number] = dm
+        log.info("Fetching existing labels from target repo...")
+        target_labels_cache = {lbl.name: lbl for lbl in load_label_cache(target_repo)}
+        log.info("Found %s labels in target.", len(target_labels_cache))
+
+    # Only create the labels missing from the target, each one just once
+    missing = [name for name in needed
+               if name not in target_labels_cache and name not in failed_labels]
+    if not missing:
+        return
+
+    with ThreadPoolExecutor(max_workers=LABEL_WORKERS) as executor:
+        new_labels = executor.map(lambda name: create_label(target_repo, name, needed[name]),
+                                  missing)
+        for name, new_label in zip(missing, new_labels):
+            if new_label:
+                target_labels_cache[name] = new_label # Add to cache
             else:
-                print(f"  - Creating milestone '{sm.title}'...")
-                try:
-                    due_on_iso_string = sm.due_on.isoformat() if sm.due_on else None
-
-                    dm = target_repo.create_milestone(
-                        title=sm.title,
-                        state=sm.state,
-                        description=sm.description or '',
-                        due_on=due_on_iso_string # <--- USE THE CONVERTED STRING
-                    )
-                    print(f"    -> Created milestone number {dm.number}.")
-                    milestone_map[sm.number] = dm
-                    target_milestones_titles[dm.title] = dm # Add to local map
-                except github3.exceptions.GitHubException as e:
-                    print(f"    !! Failed to create milestone '{sm.title}': {e}")
-
-        print("Milestone cloning process finished.")
-        return milestone_map
+                failed_labels.add(name)
+
+
+def label_ids_for(names):
+    """Maps label names to the node IDs of the target repo's labels.
+
+    createIssue takes IDs rather than names, saving Github from resolving
+    each name on every call. Labels that couldn't be created are skipped.
+    """
+    return [target_labels_cache[name].node_id for name in names if name in target_labels_cache]
 
+
+# Not idempotent, so only retried when Github turned the request away
+@retry_with_backoff(retry_on=RATE_LIMIT_STATUS, retry_connection_errors=False)
+def paced_create_milestone(target_repo, **kwargs):
+    """Runs target_repo.create_milestone under the content limiter."""
+    with content_limiter.acquire():
+        return target_repo.create_milestone(**kwargs)
+
+
+def create_milestone(target_repo, sm):
+    """Creates a copy of source milestone sm in the target repo, returning it (or None)."""
+    log.info("  - Creating milestone '%s'...", sm.title)
+    try:
+        dm = paced_create_milestone(
+            target_repo,
+            title=sm.title,
+            state=sm.state,
+            description=sm.description or '',
+            due_on=sm.due_on # Already an ISO 8601 string from GraphQL
+        )
+        log.info("    -> Created milestone '%s' as number %s.", sm.title, dm.number)
+        return dm
     except github3.exceptions.GitHubException as e:
-        print(f"!! Error during milestone cloning: {e}")
-        return milestone_map # Return whatever we managed to map
+        # 422 usually means it already exists (e.g. created by an earlier attempt)
+        if getattr(e, 'code', None) == 422:
+            log.warning("    Milestone '%s' likely already exists (422).", sm.title)
+            try:
+                existing = {m.title: m for m in load_milestone_cache(target_repo)}.get(sm.title)
+            except github3.exceptions.GitHubException:
+                existing = None
+            if existing is None:
+                log.warning("    Could not confirm existence of '%s'.", sm.title)
+            return existing
+        log.error("    !! Failed to create milestone '%s': %s", sm.title, e)
+        return None
+
+
+def clone_milestone(target_repo, sm, milestone_map):
+    """Maps source milestone sm to the target repo's, creating it if it doesn't exist.
+
+    Milestones are only looked at once an issue references them, so runs
+    whose issues have no milestones never list them at all. Returns the
+    target milestone, or None if it couldn't be cloned.
+    """
+    global target_milestones_cache
+
+    if sm.number in milestone_map:
+        return milestone_map[sm.number]
+
+    # Fetch and cache target milestones once if not already done
+    if target_milestones_cache is None:
+        log.info("Fetching existing milestones from target repo...")
+        try:
+            target_milestones_cache = {m.title: m for m in load_milestone_cache(target_repo)}
+        except github3.exceptions.GitHubException as e:
+            log.error("!! Error fetching milestones: %s", e)
+            target_milestones_cache = {}
+        log.info("Found %s milestones in target.", len(target_milestones_cache))
+
+    if sm.title in target_milestones_cache:
+        log.info("  - Milestone '%s' already exists.", sm.title)
+        dm = target_milestones_cache[sm.title]
+    else:
+        dm = create_milestone(target_repo, sm)
+        if dm:
+            target_milestones_cache[dm.title] = dm # Add to cache
+
+    milestone_map[sm.number] = dm # Also remember failures, so they aren't retried
+    return dm
+
+
+def create_issue_mutation(session, issue_inputs):
+    """Creates issues using one GraphQL request of aliased createIssue mutations.
+
+    Returns the response data, keyed by alias ('i0', 'i1', ...).
+    """
+    params = ', '.join(f'$i{n}: CreateIssueInput!' for n in range(len(issue_inputs)))
+    fields = '\n  '.join(f'i{n}: createIssue(input: $i{n}) {{ issue {{ number }} }}'
+                         for n in range(len(issue_inputs)))
+    mutation = f'mutation({params}) {{\n  {fields}\n}}'
+    variables = {f'i{n}': issue_input for n, issue_input in enumerate(issue_inputs)}
+    return graphql(session, mutation, variables, timeout=MUTATION_TIMEOUT)
+
 
+@retry_with_backoff(retry_on=RATE_LIMIT_STATUS, retry_connection_errors=False)
+def paced_issue_mutation(session, issue_inputs):
+    """Runs create_issue_mutation under the content limiter.
 
-def create_issues(target_repo, issues_list, selection_label, whitelist_labels, milestone_map):
-    """Creates issues in the target repository based on the source list."""
-    print(f"\nStarting creation of {len(issues_list)} issues in '{target_repo.full_name}'...")
+    Creating issues isn't idempotent, so this is only retried when rate limited.
+    """
+    with content_limiter.acquire(cost=len(issue_inputs)):
+        return create_issue_mutation(session, issue_inputs)
+
+
+def load_checkpoint(checkpoint_path):
+    """Reads the numbers of the source issues copied by earlier runs."""
+    done = set()
+    try:
+        with open(checkpoint_path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    done.add(json.loads(line)['src'])
+                except (ValueError, KeyError, TypeError):
+                    # Most likely cut short by an interrupted run
+                    log.warning("Ignoring unreadable line in '%s': %s", checkpoint_path, line.strip())
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def open_checkpoint(checkpoint_path):
+    """Opens the checkpoint file for appending.
+
+    If an interrupted run left the last line unfinished, it's ended first,
+    so that it doesn't swallow the next record.
+    """
+    with open(checkpoint_path, 'ab+') as f:
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+    return open(checkpoint_path, 'a')
+
+
+def record_created(checkpoint, issue, number):
+    """Notes that source issue was created as target issue number."""
+    log.info("  -> Created issue #%s from source issue #%s.", number, issue['number'])
+    with checkpoint_lock:
+        checkpoint.write(json.dumps({'src': issue['number'], 'tgt': number}) + '\n')
+        checkpoint.flush()
+
+
+def fail_batch(batch, e):
+    """Stops the run after a batch failed without saying what it created."""
+    log.error("  !! Batch of %s issues failed (%s). Some of them may have "
+              "been created anyway; check the target repo before re-running.", len(batch), e)
+    batch_failed.set()
+    sys.exit(1)
+
+
+def create_issue_batch(target_repo, batch, checkpoint):
+    """Creates a batch of (source issue, CreateIssueInput) pairs in the target.
+
+    Each created issue is recorded in the checkpoint file straight away, so
+    that an interrupted run can be resumed without creating duplicates. If
+    some of the issues were rate limited, just those are sent again after
+    backing off.
+    """
     created_count = 0
-    batch_count = 0
-
-    for issue in issues_list:
-        print(f"\nProcessing source issue #{issue['number']}: '{issue['title']}'")
-
-        # 1. Ensure labels exist
-        create_labels(target_repo, issue['labels'], selection_label, whitelist_labels)
-
-        # 2. Prepare labels list for new issue
-        target_labels_names = []
-        for l in issue['labels']:
-            if l.name == selection_label or len(whitelist_labels) == 0 or l.name in whitelist_labels:
-                target_labels_names.append(l.name)
-        
-        print(f"  - Using labels: {', '.join(target_labels_names) if target_labels_names else 'None'}")
-
-        # 3. Prepare milestone number
-        target_milestone_number = None
-        if issue['milestone']:
-            source_ms_number = issue['milestone'].number
-            if source_ms_number in milestone_map:
-                target_milestone_object = milestone_map[source_ms_number]
-                target_milestone_number = target_milestone_object.number
-                print(f"  - Assigning to milestone: '{target_milestone_object.title}' ({target_milestone_number})")
-            else:
-                print(f"  - Warning: Source milestone '{issue['milestone'].title}' (Number: {source_ms_number}) "
-                      f"was not found or cloned to target. Skipping assignment.")
+    pending = batch
+
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        if batch_failed.is_set():
+            return created_count
 
-        # 4. Create the issue
+        error = None
         try:
-            new_issue = target_repo.create_issue(
-                title=issue['title'],
-                body=issue['body'],
-                labels=target_labels_names if target_labels_names else None,
-                milestone=target_milestone_number
-                # Assignees are not supported directly in create_issue with github3.py
-            )
-            print(f"  -> Successfully created issue #{new_issue.number}.")
-            created_count += 1
-            batch_count += 1
-
-            # 5. Rate Limiting
-            if batch_count >= 10:
-                print('\nSleeping for 60 seconds to avoid Github\'s secondary rate limit...')
-                time.sleep(60)
-                batch_count = 0
+            data = paced_issue_mutation(target_repo.session, [i for _, i in pending])
+        except GraphQLError as e:
+            if e.data is None:
+                # Github may have timed out part way through, in which case
+                # we can't tell which issues were created
+                fail_batch(pending, e)
+            # Github answered per issue, so we know exactly which ones got created
+            error, data = e, e.data
+        except (github3.exceptions.GitHubException, requests.exceptions.RequestException) as e:
+            # After a 5xx or a timeout some of the issues may well exist, so
+            # re-sending them could create duplicates
+            fail_batch(pending, e)
+
+        # Record everything that did get created before retrying anything, so
+        # that a failed retry can't leave created issues out of the checkpoint
+        failed = []
+        for n, (issue, issue_input) in enumerate(pending):
+            result = data.get(f'i{n}')
+            if result is None:
+                failed.append((issue, issue_input))
+            else:
+                record_created(checkpoint, issue, result['issue']['number'])
+                created_count += 1
 
-        except github3.exceptions.GitHubException as e:
-            print(f"  !! Failed to create issue '{issue['title']}': {e}")
+        if not failed:
+            return created_count
+
+        if error is None or not is_rate_limited(error) or attempt == RETRY_ATTEMPTS:
+            log.error("  !! Failed to create %s issues: %s", len(failed), error)
             # Consider exiting or continuing. Exiting for now to match original script style.
+            batch_failed.set()
             sys.exit(1)
 
+        delay = retry_delay(error, attempt, RETRY_BASE, RETRY_JITTER)
+        log.warning("  %s issues were rate limited, resending them in %.1f seconds...",
+                    len(failed), delay)
+        time.sleep(delay)
+        pending = failed
+
+    return created_count
+
+
+def collect_batches(futures):
+    """Removes finished batches from futures, returning the number of issues
+    they created. Re-raises the error of a batch that failed."""
+    created_count = 0
+    for future in [f for f in futures if f.done()]:
+        futures.remove(future)
+        created_count += future.result()
+    return created_count
+
+
+def create_issues(target_repo, issues, selection_label, whitelist_labels, clone_milestones,
+                  checkpoint_path):
+    """Creates issues in the target repository while they're still being fetched.
+
+    Source issues listed in the checkpoint file (i.e. already copied by an
+    earlier run) are skipped.
+    """
+    log.info("\nStarting creation of issues in '%s'...", target_repo.full_name)
+    done = load_checkpoint(checkpoint_path)
+    if done:
+        log.info("Resuming from '%s': %s issues were already copied.", checkpoint_path, len(done))
+    created_count = 0
+    skipped_count = 0
+    batch = []
+    futures = []
+    copy_all_labels = not whitelist_labels
+    # Labels to copy, or None to copy them all
+    allowed = None if copy_all_labels else whitelist_labels | {selection_label}
+    milestone_map = {} # Maps source_number -> target_object (or None)
+
+    # Fetch in the background, so that creation overlaps with fetching
+    issue_queue = queue.Queue(maxsize=ISSUE_QUEUE_SIZE)
+    fetch_errors = []
+    threading.Thread(target=queue_issues, args=(issues, issue_queue, fetch_errors),
+                     daemon=True).start()
+
+    checkpoint = open_checkpoint(checkpoint_path)
+    executor = ThreadPoolExecutor(max_workers=ISSUE_WORKERS)
+    try:
+        for issue in iter(issue_queue.get, None):
+            # Stop as soon as a batch has failed, rather than going on
+            # fetching and creating labels and milestones for nothing
+            created_count += collect_batches(futures)
+
+            if issue['number'] in done:
+                log.debug("\nSkipping source issue #%s, already copied.", issue['number'])
+                skipped_count += 1
+                continue
+
+            log.debug("\nProcessing source issue #%s: '%s'", issue['number'], issue['title'])
+
+            # 1. Pick the labels to copy, with one set intersection
+            source_labels = {l.name: l.color for l in issue['labels']}
+            target_labels_names = source_labels.keys() if allowed is None \
+                                  else source_labels.keys() & allowed
+
+            # 2. Ensure labels exist; only ones not seen before cost an API call
+            ensure_labels_bulk(target_repo, {name: source_labels[name] for name in target_labels_names})
+
+            log.debug("  - Using labels: %s", ', '.join(target_labels_names) or 'None')
+
+            # 3. Prepare milestone
+            target_milestone_id = None
+            if issue['milestone']:
+                source_ms_number = issue['milestone'].number
+                target_milestone_object = None
+                if clone_milestones:
+                    target_milestone_object = clone_milestone(target_repo, issue['milestone'], milestone_map)
+                if target_milestone_object:
+                    target_milestone_id = target_milestone_object.node_id
+                    log.debug("  - Assigning to milestone: '%s' (%s)",
+                              target_milestone_object.title, target_milestone_object.number)
+                else:
+                    log.warning("  - Warning: Source milestone '%s' (Number: %s) "
+                                "was not found or cloned to target. Skipping assignment.",
+                                issue['milestone'].title, source_ms_number)
+
+            # 4. Queue the issue; GraphQL wants node IDs rather than names/numbers
+            batch.append((issue, {
+                'repositoryId': target_repo.node_id,
+                'title': issue['title'],
+                'body': issue['body'],
+                'labelIds': label_ids_for(target_labels_names),
+                'milestoneId': target_milestone_id
+            }))
+
+            # 5. Hand full batches to the workers; the content limiter does the rate limiting
+            if len(batch) >= ISSUE_BATCH_SIZE:
+                futures.append(executor.submit(create_issue_batch, target_repo, batch, checkpoint))
+                batch = []
+
+        if batch:
+            futures.append(executor.submit(create_issue_batch, target_repo, batch, checkpoint))
+
+        if fetch_errors:
+            raise fetch_errors[0]
+        for future in as_completed(futures):
+            created_count += future.result()
+    finally:
+        # Don't start any more batches if one of them failed
+        executor.shutdown(cancel_futures=True)
+        checkpoint.close()
+
+    if skipped_count:
+        log.info("\nSkipped %s issues copied by an earlier run.", skipped_count)
     return created_count
 
 
 if __name__ == '__main__':
     args = read_command_line()
 
+    # Buffer the output rather than writing every line separately; it's
+    # flushed every 256 lines, on warnings (so retry notices show up before
+    # their backoff sleeps), and at exit. The formatter belongs on the
+    # stream, since the MemoryHandler only passes records through to it.
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter('%(message)s'))
+    output = logging.handlers.MemoryHandler(capacity=256, flushLevel=logging.WARNING, target=stream)
+    logging.basicConfig(handlers=[output])
+    log.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+
     # Get the Github token
     GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN') # Simpler way to get env var
     if not GITHUB_TOKEN:
@@ -216,64 +768,71 @@ if __name__ == '__main__':
             pass
 
     if not GITHUB_TOKEN:
-        print('No Github token could be found. Create ~/.github-token containing it, '
-              'or set it in the GITHUB_TOKEN environment variable.')
+        log.error('No Github token could be found. Create ~/.github-token containing it, '
+                  'or set it in the GITHUB_TOKEN environment variable.')
         sys.exit(1)
 
-    # Login to Github
-    print("Logging into GitHub...")
+    # Login to Github. This doesn't make a request; a bad token shows up as a
+    # 401 when opening the source repo below, saving a round-trip to check it
+    log.info("Logging into GitHub...")
     try:
         github_session = github3.login(token=GITHUB_TOKEN)
-        # Check if login was successful (optional but good practice)
-        if not github_session.me():
-             print("Login failed. Check your token and permissions.")
-             sys.exit(1)
-        print("Login successful.")
     except Exception as e:
-        print(f'Error logging into Github: {e}')
+        log.error('Error logging into Github: %s', e)
         sys.exit(1)
 
+    # The worker threads all share this session; give it enough pooled
+    # keep-alive connections that they don't keep redoing TLS handshakes
+    adapter = requests.adapters.HTTPAdapter(pool_connections=HTTP_POOL_SIZE,
+                                            pool_maxsize=HTTP_POOL_SIZE)
+    github_session.session.mount('https://', adapter)
+
     # Get repository objects
     try:
-        print(f"Accessing source repo: {args.source_owner}/{args.source_repo}")
+        log.info("Accessing source repo: %s/%s", args.source_owner, args.source_repo)
         source_repo = github_session.repository(args.source_owner, args.source_repo)
         if not source_repo: # Check if repo object was returned
-            print(f"Could not access source repo '{args.source_owner}/{args.source_repo}'. Check name/permissions.")
+            log.error("Could not access source repo '%s/%s'. Check name/permissions.", args.source_owner, args.source_repo)
             sys.exit(1)
+    except github3.exceptions.AuthenticationFailed:
+        log.error("Login failed. Check your token and permissions.")
+        sys.exit(1)
     except Exception as e:
-        print(f'Error opening the source repository: {e}')
+        log.error('Error opening the source repository: %s', e)
         sys.exit(1)
 
     try:
-        print(f"Accessing target repo: {args.target_owner}/{args.target_repo}")
+        log.info("Accessing target repo: %s/%s", args.target_owner, args.target_repo)
         target_repo = github_session.repository(args.target_owner, args.target_repo)
         if not target_repo: # Check if repo object was returned
-            print(f"Could not access target repo '{args.target_owner}/{args.target_repo}'. Check name/permissions.")
+            log.error("Could not access target repo '%s/%s'. Check name/permissions.", args.target_owner, args.target_repo)
             sys.exit(1)
     except Exception as e:
-        print(f'Error opening the target repository: {e}')
+        log.error('Error opening the target repository: %s', e)
         sys.exit(1)
 
-    # Parse whitelist
-    whitelist = [w.strip() for w in args.whitelist.split(',') if w.strip()]
+    # Parse whitelist; a frozenset makes the per-label membership checks O(1)
+    whitelist = frozenset(w.strip() for w in args.whitelist.split(',') if w.strip())
     if whitelist:
-        print(f"Using label whitelist: {whitelist}")
+        log.info("Using label whitelist: %s", ', '.join(sorted(whitelist)))
 
-    # Perform the copy of milestones (if requested)
-    milestone_map_data = {} # Initialize empty map
+    # Milestones (if requested) are cloned as the issues referencing them come in
     if args.clone_milestones:
-        print("\n-- Milestone Cloning Enabled --")
-        milestone_map_data = clone_milestones(source_repo, target_repo)
+        log.info("\n-- Milestone Cloning Enabled --")
     else:
-        print("\n-- Milestone Cloning Disabled --")
+        log.info("\n-- Milestone Cloning Disabled --")
 
-    # Perform the copy of issues...
-    source_issues_list = get_issues(source_repo, args.label)
+    # Created issues are recorded here, so a failed run can simply be re-run
+    checkpoint_file = (f'{args.source_owner}-{args.source_repo}-to-'
+                       f'{args.target_owner}-{args.target_repo}.checkpoint.jsonl')
 
-    if not source_issues_list:
-        print("\nNo issues matching the criteria found. Exiting.")
-        sys.exit(0)
+    # Perform the copy of issues, streaming them from source to target...
+    source_issues = get_issues(source_repo, args.label, not args.no_body)
+    num_created = create_issues(target_repo, source_issues, args.label, whitelist,
+                                args.clone_milestones, checkpoint_file)
 
-    num_created = create_issues(target_repo, source_issues_list, args.label, whitelist, milestone_map_data)
+    if not num_created:
+        log.info("\nNo (new) issues matching the criteria found. Exiting.")
+        sys.exit(0)
 
-    print(f'\nFinished. Copied {num_created} tasks.')
+    log.info('\nFinished. Copied %s tasks.', num_created)